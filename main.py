@@ -11,23 +11,226 @@ A desktop application for managing audio recordings during Microsoft Teams meeti
 import os
 import sys
 import threading
+import queue
 import logging
+import logging.handlers
+import atexit
 import signal
 import json
-import time
 from datetime import datetime
-from tkinter import Tk, messagebox, filedialog, StringVar, BooleanVar, Checkbutton, Label, Entry, Button
 
 import numpy as np
 import sounddevice as sd
-import lameenc
 from pystray import Icon, Menu, MenuItem
 from PIL import Image
-from websocket import create_connection, WebSocketConnectionClosedException
+from websocket import create_connection, WebSocketException, WebSocketConnectionClosedException
 import configparser
-import pyautogui
 import winreg
 import ctypes
+from ctypes import wintypes
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Fallback priority for audio threads when MMCSS is unavailable
+THREAD_PRIORITY_ABOVE_NORMAL = 1
+
+# Interval at which the Tk thread picks up queued UI work, in milliseconds
+UI_POLL_MS = 100
+
+# Local Teams client third-party API endpoint
+TEAMS_API_URL = "ws://localhost:8124"
+
+# Registry key holding per-user startup programs
+RUN_KEY = r"Software\Microsoft\Windows\CurrentVersion\Run"
+
+# Capacity of each capture ring buffer, in blocks of `buffer_size` frames
+RING_BLOCKS = 16
+# Allowed lag between the two capture rings, in blocks, before they are realigned
+MAX_DRIFT_BLOCKS = 2
+# Time without a complete block from both devices before capture is treated as failed, in seconds
+CAPTURE_STALL_SECONDS = 3
+# Capacity of the ring buffer feeding the MP3 encoder, in blocks
+ENCODE_RING_BLOCKS = 32
+# Number of mixed blocks passed to LAME per encode call
+ENCODE_BATCH_BLOCKS = 8
+# Write buffer size for the MP3 file
+MP3_WRITE_BUFFER = 1024 * 1024
+
+
+if njit is not None:
+    # Numba cannot cache compiled code for frozen (PyInstaller) builds, they have no source file.
+    # The explicit signature compiles at import, not on the first block of the first recording.
+    @njit("void(int16[::1], int16[::1], int16[::1], int32[::1])",
+          nogil=True, cache=not getattr(sys, "frozen", False))
+    def mix_clip(a, b, out, scratch):
+        """
+        Saturating mix of flat int16 sample arrays `a` and `b` into `out`, compiled without the GIL.
+        A single flat loop with min/max lets LLVM vectorize it; `scratch` is only used by the NumPy fallback.
+        """
+        for i in range(a.shape[0]):
+            out[i] = min(max(np.int32(a[i]) + np.int32(b[i]), -32768), 32767)
+else:
+    def mix_clip(a, b, out, scratch):
+        """
+        Saturating mix of flat int16 sample arrays `a` and `b` into `out`.
+        Sums into the int32 `scratch` buffer, clips to the 16-bit range and casts back.
+        """
+        np.add(a, b, out=scratch, dtype=np.int32)
+        np.clip(scratch, -32768, 32767, out=scratch)
+        out[:] = scratch
+
+
+if msgspec is not None:
+    # Typed view of the Teams update fields used by the app; all other fields are ignored
+    class MeetingPermissions(msgspec.Struct):
+        canToggleMute: bool = False
+
+    class MeetingUpdate(msgspec.Struct):
+        meetingPermissions: MeetingPermissions = msgspec.field(default_factory=MeetingPermissions)
+
+    class TeamsUpdate(msgspec.Struct):
+        meetingUpdate: MeetingUpdate = msgspec.field(default_factory=MeetingUpdate)
+
+    teams_update_decoder = msgspec.json.Decoder(TeamsUpdate)
+
+    def parse_can_toggle_mute(message):
+        """
+        Return the `canToggleMute` meeting permission from a Teams update message.
+        Decodes straight into typed structs, skipping every field that is not needed.
+        Fields of an unexpected type (e.g. null) count as False, like the json fallback.
+        """
+        try:
+            update = teams_update_decoder.decode(message)
+        except msgspec.ValidationError:
+            return False
+        return update.meetingUpdate.meetingPermissions.canToggleMute
+else:
+    def parse_can_toggle_mute(message):
+        """
+        Return the `canToggleMute` meeting permission from a Teams update message.
+        """
+        update = json.loads(message)
+        try:
+            return update["meetingUpdate"]["meetingPermissions"]["canToggleMute"]
+        except (KeyError, TypeError):
+            return False
+
+
+def boost_thread_priority():
+    """
+    Raise the scheduling priority of the calling thread for audio work.
+    Registers the thread with the Multimedia Class Scheduler ("Pro Audio" task) and falls
+    back to THREAD_PRIORITY_ABOVE_NORMAL if that is unavailable.
+    Returns the MMCSS handle to pass to `restore_thread_priority`, or None.
+    """
+    try:
+        avrt = ctypes.windll.avrt
+        avrt.AvSetMmThreadCharacteristicsW.restype = wintypes.HANDLE
+        avrt.AvSetMmThreadCharacteristicsW.argtypes = [wintypes.LPCWSTR, ctypes.POINTER(wintypes.DWORD)]
+        task_index = wintypes.DWORD(0)
+        handle = avrt.AvSetMmThreadCharacteristicsW("Pro Audio", ctypes.byref(task_index))
+        if handle:
+            return handle
+    except Exception as e:
+        logging.warning(f"MMCSS registration failed: {e}")
+
+    try:
+        kernel32 = ctypes.windll.kernel32
+        kernel32.GetCurrentThread.restype = wintypes.HANDLE
+        kernel32.SetThreadPriority.argtypes = [wintypes.HANDLE, ctypes.c_int]
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_ABOVE_NORMAL)
+    except Exception as e:
+        logging.warning(f"Failed to raise thread priority: {e}")
+    return None
+
+
+def restore_thread_priority(handle):
+    """
+    Undo the MMCSS registration made by `boost_thread_priority`.
+    """
+    if handle:
+        avrt = ctypes.windll.avrt
+        avrt.AvRevertMmThreadCharacteristics.argtypes = [wintypes.HANDLE]
+        avrt.AvRevertMmThreadCharacteristics(handle)
+
+
+class RingBuffer:
+    """
+    Single-producer/single-consumer ring buffer of int16 audio frames.
+    The producer (a PortAudio callback or the capture thread) only advances the write index
+    and the consumer (the capture or encoder thread) only advances the read index, so no lock is needed.
+    """
+    def __init__(self, capacity, channels):
+        # Round the capacity up to a power of two so indices can be masked
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self._data = np.zeros((size, channels), dtype=np.int16)
+        self._mask = size - 1
+        self._read_index = 0
+        self._write_index = 0
+        self.dropped = 0  # Frames discarded because the consumer fell behind
+        self.overflows = 0  # Input overflows reported by the device feeding this ring
+
+    @property
+    def read_space(self):
+        """
+        Number of frames available for reading.
+        """
+        return self._write_index - self._read_index
+
+    @property
+    def write_space(self):
+        """
+        Number of frames that can be written without overwriting unread data.
+        """
+        return len(self._data) - self.read_space
+
+    def write(self, frames):
+        """
+        Copy `frames` into the buffer. Frames that do not fit are dropped.
+        Returns the number of frames written.
+        """
+        count = min(len(frames), self.write_space)
+        start = self._write_index & self._mask
+        first = min(count, len(self._data) - start)
+        self._data[start:start + first] = frames[:first]
+        self._data[:count - first] = frames[first:count]
+        self.dropped += len(frames) - count
+        self._write_index += count
+        return count
+
+    def skip(self, count):
+        """
+        Discard up to `count` of the oldest unread frames. Must be called by the consumer.
+        """
+        count = min(count, self.read_space)
+        self._read_index += count
+        return count
+
+    def read_into(self, out):
+        """
+        Copy `len(out)` frames into `out`.
+        Returns False without consuming anything if not enough frames are available.
+        """
+        count = len(out)
+        if self.read_space < count:
+            return False
+        start = self._read_index & self._mask
+        first = min(count, len(self._data) - start)
+        out[:first] = self._data[start:start + first]
+        out[first:] = self._data[:count - first]
+        self._read_index += count
+        return True
+
 
 class TeamsHelperRecorder:
     """
@@ -38,34 +241,63 @@ class TeamsHelperRecorder:
         self.sample_rate = sample_rate
         self.channels = channels
         self.buffer_size = buffer_size
-        self.recording = False
+        self._mixbuf = np.empty((buffer_size, channels), dtype=np.int32)  # Mix accumulator for the NumPy mixer
+        self._out16 = np.empty((buffer_size, channels), dtype=np.int16)  # Clipped mix fed to the encoder
+        self.recording_event = threading.Event()  # Set while mixed audio is written to a file
+        self.stop_event = threading.Event()  # Signals the capture thread to finish
+        # Serializes opening/closing capture with PortAudio re-initialization; reentrant
+        # because reload_audio_devices stops and restarts capture while holding it
+        self.capture_lock = threading.RLock()
+        self.capture_thread = None  # Thread mixing the long-lived capture streams
+        self.encoder_thread = None  # Thread encoding the current recording
+        self.encode_ring = None  # Mixed frames waiting for the encoder
+        self.encode_stop = threading.Event()  # Tells the encoder to drain, flush and exit
+        self.mp3_file = None  # Path of the current recording
+        self.peak = 0  # Sampled peak level of the current recording
         self.stop_flag = False
         self.frames = []
         self.ws = None
+        self.teams_thread = None  # Thread running the Teams WebSocket loop
+        self.ws_url = f"{TEAMS_API_URL}?protocol-version=2.0.0&manufacturer=Kyvaith&device=TeamsHelper&app=TeamsHelper&app-version=1.0"
         self.can_toggle_mute = False
         self.record_all_meetings = True  # Default to True
         self.keep_available = False  # State for Mouse Jiggler
         self.jiggler_thread = None  # Thread for Mouse Jiggler     
+        self.jiggler_stop = threading.Event()  # Wakes the Mouse Jiggler thread to stop it
         self.settings_window_ref = None  # Reference to the Settings window        
+        self.tk_root = None  # Hidden Tk root for popups, created on first use
+        self.tk_thread = None  # Thread running the Tk root's event loop
+        self.tk_lock = threading.Lock()
+        self.ui_queue = queue.SimpleQueue()  # Callables to run on the Tk thread
+        self.log_queue = None  # Records waiting for the log listener
+        self.log_listener = None  # Background thread writing queued log records to app.log
+        self.log_file = None
+        self.ensured_dirs = set()  # Directories already created during this run
         
         # Paths and settings
         self.settings_file = os.path.join(os.getenv("APPDATA"), "teamshelper", "settings.ini")
+        self.output_dir = None  # Set by load_settings, or by save_settings on first run
         self.output_dir = self.load_settings()
-        os.makedirs(self.output_dir, exist_ok=True)
+        self.ensure_output_dir()
         self.tray_icon = None
+        self.icon_path = self.get_icon_path()  # Resolved once, used by the tray and Settings window
+        self.icon_image = None  # Decoded tray icon, loaded on first use
 
         # Logging setup
         self.configure_logging()
 
-        # LAME MP3 encoder setup
-        self.encoder = lameenc.Encoder()
-        self.encoder.set_bit_rate(128)
-        self.encoder.set_in_sample_rate(self.sample_rate)
-        self.encoder.set_channels(self.channels)
-        self.encoder.set_quality(2)
+        # Audio device lookup, cached so recording start does not enumerate devices
+        self.device_names = []
+        self.stereo_mix_device = None
+        self.microphone_device = None
+        self.refresh_devices()
 
-	# Autostart check and update
-        if self.is_autostart_enabled():
+        # LAME MP3 encoder, created for each recording
+        self.encoder = None
+
+	# Autostart check and update, cached for the Settings window
+        self.autostart_enabled = self.is_autostart_enabled()
+        if self.autostart_enabled:
             logging.info("Autostart is enabled and verified.")
         else:
             logging.info("Autostart is not enabled.")
@@ -79,6 +311,23 @@ class TeamsHelperRecorder:
             return os.path.join(sys._MEIPASS, "icon.ico")
         return os.path.join(os.path.dirname(__file__), "icon.ico")
 
+    @property
+    def recording(self):
+        """
+        Whether a recording is currently being written.
+        """
+        return self.recording_event.is_set()
+
+    def get_icon_image(self):
+        """
+        Return the tray icon image, opening and decoding `icon.ico` only the first time.
+        """
+        if self.icon_image is None:
+            self.icon_image = Image.open(self.icon_path)
+            # Decode the pixels now rather than whenever pystray first reads them
+            self.icon_image.load()
+        return self.icon_image
+
     def set_tray_icon(self, icon):
         """
         Set the tray icon object for the application.
@@ -97,24 +346,20 @@ class TeamsHelperRecorder:
     def is_autostart_enabled(self):
         """
         Check if the application is set to autostart with Windows and update the entry if necessary.
+        Reads the registry; use `autostart_enabled` for the cached state.
         """
         try:
-            key = winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER, 
-                r"Software\Microsoft\Windows\CurrentVersion\Run", 
-                0, 
-                winreg.KEY_READ
-            )
-            value, regtype = winreg.QueryValueEx(key, "TeamsHelper")
-            winreg.CloseKey(key)
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0,
+                                winreg.KEY_READ | winreg.KEY_SET_VALUE) as key:
+                value, regtype = winreg.QueryValueEx(key, "TeamsHelper")
 
-            current_executable_path = f'"{os.path.abspath(sys.argv[0])}"'
-            if value != current_executable_path:
-                # Update the autostart entry with the new path
-                self.enable_autostart()
-                logging.info("Updated autostart path to: %s", current_executable_path)
+                current_executable_path = f'"{os.path.abspath(sys.argv[0])}"'
+                if value != current_executable_path:
+                    # Update the autostart entry with the new path, reusing the open key
+                    winreg.SetValueEx(key, "TeamsHelper", 0, winreg.REG_SZ, current_executable_path)
+                    logging.info("Updated autostart path to: %s", current_executable_path)
 
-            return value == current_executable_path
+            return True
         except FileNotFoundError:
             return False
         except Exception as e:
@@ -130,15 +375,10 @@ class TeamsHelperRecorder:
             executable_path = os.path.abspath(sys.argv[0])
 
             # Add the executable path to the Windows startup registry
-            key = winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER, 
-                r"Software\Microsoft\Windows\CurrentVersion\Run", 
-                0, 
-                winreg.KEY_SET_VALUE
-            )
-            winreg.SetValueEx(key, "TeamsHelper", 0, winreg.REG_SZ, f'"{executable_path}"')
-            winreg.CloseKey(key)
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0, winreg.KEY_SET_VALUE) as key:
+                winreg.SetValueEx(key, "TeamsHelper", 0, winreg.REG_SZ, f'"{executable_path}"')
 
+            self.autostart_enabled = True
             logging.info("Autostart enabled with executable: %s", executable_path)
         except Exception as e:
             logging.error(f"Failed to enable autostart: {e}")
@@ -148,16 +388,12 @@ class TeamsHelperRecorder:
         Disable autostart by removing the application from Windows startup registry.
         """
         try:
-            key = winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER, 
-                r"Software\Microsoft\Windows\CurrentVersion\Run", 
-                0, 
-                winreg.KEY_SET_VALUE
-            )
-            winreg.DeleteValue(key, "TeamsHelper")
-            winreg.CloseKey(key)
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0, winreg.KEY_SET_VALUE) as key:
+                winreg.DeleteValue(key, "TeamsHelper")
+            self.autostart_enabled = False
             logging.info("Autostart disabled.")
         except FileNotFoundError:
+            self.autostart_enabled = False
             logging.info("Autostart entry not found, nothing to disable.")
         except Exception as e:
             logging.error(f"Failed to disable autostart: {e}")
@@ -180,112 +416,204 @@ class TeamsHelperRecorder:
     def save_settings(self, output_dir):
         """
         Save application settings to the configuration file.
+        Does nothing if the output directory is unchanged; otherwise updates only
+        that value and keeps anything else stored in the file.
         """
+        if output_dir == self.output_dir:
+            return
         config = configparser.ConfigParser()
-        config["Settings"] = {"output_dir": output_dir}
+        config.read(self.settings_file)
+        if not config.has_section("Settings"):
+            config.add_section("Settings")
+        config["Settings"]["output_dir"] = output_dir
         with open(self.settings_file, "w") as configfile:
             config.write(configfile)
         self.output_dir = output_dir
-        os.makedirs(self.output_dir, exist_ok=True)
+        self.ensure_output_dir()
         self.configure_logging()
 
+    def ensure_output_dir(self):
+        """
+        Create the output directory unless it was already created during this run.
+        """
+        if self.output_dir not in self.ensured_dirs:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self.ensured_dirs.add(self.output_dir)
+
     def configure_logging(self):
         """
         Configure logging to save logs in the output directory.
+        Logs at INFO level; set the TEAMSHELPER_DEBUG=1 environment variable for DEBUG output.
+        Called again when the output directory changes to move logging to the new app.log.
         """
-        self.log_file = os.path.join(self.output_dir, "app.log")
-        logging.basicConfig(
-            filename=self.log_file,
-            level=logging.DEBUG,
-            format="%(asctime)s - %(levelname)s - %(message)s",
-        )
-        logging.getLogger("PIL").setLevel(logging.WARNING)
+        log_file = os.path.join(self.output_dir, "app.log")
+        if log_file == self.log_file:
+            return
+        self.log_file = log_file
+
+        file_handler = logging.FileHandler(self.log_file)
+        file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+        if self.log_queue is None:
+            # Threads only enqueue records; a background listener does the file I/O,
+            # so the audio and WebSocket threads never wait on the disk
+            self.log_queue = queue.SimpleQueue()
+            root_logger = logging.getLogger()
+            root_logger.handlers = [logging.handlers.QueueHandler(self.log_queue)]
+            root_logger.setLevel(logging.DEBUG if os.getenv("TEAMSHELPER_DEBUG") == "1" else logging.INFO)
+            logging.getLogger("PIL").setLevel(logging.WARNING)
+            # Write out queued records on exit, before logging closes the file handler
+            atexit.register(self.stop_logging)
+        else:
+            # Finish writing records queued for the old file, then switch files
+            self.stop_logging()
+        self.log_listener = logging.handlers.QueueListener(self.log_queue, file_handler)
+        self.log_listener.start()
         logging.info("Teams Helper started. Recordings and logs will be saved in '%s'.", self.output_dir)
 
+    def stop_logging(self):
+        """
+        Stop the log listener once it has written all queued records, and close its file.
+        """
+        if self.log_listener is not None:
+            self.log_listener.stop()
+            for handler in self.log_listener.handlers:
+                handler.close()
+            self.log_listener = None
+
+    def start_ui_thread(self):
+        """
+        Start the thread owning the hidden Tk root shared by all popups, if it is not running yet.
+        The main thread runs the tray icon, so Tk lives on its own thread and other threads
+        never call into Tk directly: they put callables on `ui_queue` instead.
+        """
+        with self.tk_lock:
+            if self.tk_thread is None:
+                self.tk_thread = threading.Thread(target=self.run_tk_root, daemon=True)
+                self.tk_thread.start()
+
+    def run_tk_root(self):
+        """
+        Create the hidden Tk root and run its event loop on the current thread.
+        """
+        # Imported here so the tray app does not load Tcl/Tk until a window is needed
+        from tkinter import Tk
+
+        self.tk_root = Tk()
+        self.tk_root.withdraw()  # Hide the main Tkinter window
+        self.tk_root.after(0, self.run_ui_tasks)
+        self.tk_root.mainloop()
+
+    def run_ui_tasks(self):
+        """
+        Run the callables queued on `ui_queue`. Runs on the Tk thread and reschedules itself.
+        """
+        while True:
+            try:
+                task = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                task()
+            except Exception:
+                # Keep serving later popups; a failed task must not stop this loop
+                logging.exception("UI task failed")
+        # Reschedule only after the tasks ran so a modal dialog does not re-enter this loop
+        self.tk_root.after(UI_POLL_MS, self.run_ui_tasks)
+
     def show_error(self, title, message):
         """
         Display an error message in a popup window.
         """
         logging.error(f"{title}: {message}")
-        root = Tk()
-        root.withdraw()  # Hide the main Tkinter window
-        messagebox.showerror(title, message)
-        root.destroy()
+
+        def popup():
+            from tkinter import messagebox
+            messagebox.showerror(title, message, parent=self.tk_root)
+
+        self.ui_queue.put(popup)
+        self.start_ui_thread()
 
     def show_settings_window(self):
         """
         Display the settings window for changing the output directory and autostart setting.
+        The window is built on the shared Tk thread; safe to call from any thread.
+        """
+        self.ui_queue.put(self.open_settings_dialog)
+        self.start_ui_thread()
+
+    def open_settings_dialog(self):
+        """
+        Build the settings window as a Toplevel of the hidden Tk root. Runs on the Tk thread.
         If the window is already open, bring it to the front.
         """
+        from tkinter import Toplevel, messagebox, filedialog, StringVar, BooleanVar, Checkbutton, Label, Entry, Button
+
         if self.settings_window_ref is not None and self.settings_window_ref.winfo_exists():
             # If the window already exists, bring it to the front
             self.settings_window_ref.lift()
             self.settings_window_ref.focus_force()
             return
 
-        def settings_window():
-            def browse_folder():
-                """
-                Open a dialog to select a new folder.
-                """
-                folder = filedialog.askdirectory(initialdir=self.output_dir)
-                if folder:
-                    folder_var.set(folder)
-
-            def save_settings():
-                """
-                Save the selected folder and close the settings window.
-                """
-                selected_folder = folder_var.get()
-                if os.path.isdir(selected_folder):
-                    self.save_settings(selected_folder)
-                    messagebox.showinfo("Settings", f"Folder changed to: {selected_folder}")
-                else:
-                    messagebox.showerror("Error", "The selected folder does not exist. Please select a valid folder.")
-
-            def toggle_autostart():
-                """
-                Toggle the autostart functionality.
-                """
-                if autostart_var.get():
-                    self.enable_autostart()
-                    messagebox.showinfo("Autostart", "Autostart has been enabled.")
-                else:
-                    self.disable_autostart()
-                    messagebox.showinfo("Autostart", "Autostart has been disabled.")
-
-            # Create the settings window
-            self.settings_window_ref = Tk()
-            self.settings_window_ref.title("Settings")
-            self.settings_window_ref.geometry("500x200")
-            self.settings_window_ref.iconbitmap(self.get_icon_path())
-
-            # Handle window close event
-            def on_close():
-                """
-                Handle the Settings window close event.
-                """
-                self.settings_window_ref.destroy()  # Destroy the window
-                self.settings_window_ref = None  # Reset the reference
-
-            self.settings_window_ref.protocol("WM_DELETE_WINDOW", on_close)
-
-            # Current folder label and entry
-            folder_var = StringVar(value=self.output_dir)
-            Label(self.settings_window_ref, text="Current Recording Folder:", anchor="w").pack(fill="x", padx=10, pady=5)
-            Entry(self.settings_window_ref, textvariable=folder_var, state="readonly", width=60).pack(fill="x", padx=10, pady=5)
-
-            # Buttons for folder selection
-            Button(self.settings_window_ref, text="Browse...", command=browse_folder).pack(side="left", padx=10, pady=10)
-            Button(self.settings_window_ref, text="Save", command=save_settings).pack(side="right", padx=10, pady=10)
-
-            # Autostart checkbox
-            autostart_var = BooleanVar(value=self.is_autostart_enabled())
-            Checkbutton(self.settings_window_ref, text="Autostart with Windows", variable=autostart_var, command=toggle_autostart).pack(anchor="w", padx=10, pady=10)
-
-            self.settings_window_ref.mainloop()
-
-        threading.Thread(target=settings_window, daemon=True).start()
+        def browse_folder():
+            """
+            Open a dialog to select a new folder.
+            """
+            folder = filedialog.askdirectory(initialdir=self.output_dir, parent=window)
+            if folder:
+                folder_var.set(folder)
+
+        def save_settings():
+            """
+            Save the selected folder and close the settings window.
+            """
+            selected_folder = folder_var.get()
+            if os.path.isdir(selected_folder):
+                self.save_settings(selected_folder)
+                messagebox.showinfo("Settings", f"Folder changed to: {selected_folder}", parent=window)
+            else:
+                messagebox.showerror("Error", "The selected folder does not exist. Please select a valid folder.", parent=window)
+
+        def toggle_autostart():
+            """
+            Toggle the autostart functionality.
+            """
+            if autostart_var.get():
+                self.enable_autostart()
+                messagebox.showinfo("Autostart", "Autostart has been enabled.", parent=window)
+            else:
+                self.disable_autostart()
+                messagebox.showinfo("Autostart", "Autostart has been disabled.", parent=window)
+
+        # Create the settings window
+        window = Toplevel(self.tk_root)
+        window.title("Settings")
+        window.geometry("500x200")
+        window.iconbitmap(self.icon_path)
+        self.settings_window_ref = window
+
+        # Handle window close event
+        def on_close():
+            """
+            Handle the Settings window close event. Only the window is destroyed,
+            the hidden root keeps running for later popups.
+            """
+            window.destroy()  # Destroy the window
+            self.settings_window_ref = None  # Reset the reference
+
+        window.protocol("WM_DELETE_WINDOW", on_close)
+
+        # Current folder label and entry
+        folder_var = StringVar(window, value=self.output_dir)
+        Label(window, text="Current Recording Folder:", anchor="w").pack(fill="x", padx=10, pady=5)
+        Entry(window, textvariable=folder_var, state="readonly", width=60).pack(fill="x", padx=10, pady=5)
+
+        # Buttons for folder selection
+        Button(window, text="Browse...", command=browse_folder).pack(side="left", padx=10, pady=10)
+        Button(window, text="Save", command=save_settings).pack(side="right", padx=10, pady=10)
+
+        # Autostart checkbox
+        autostart_var = BooleanVar(window, value=self.autostart_enabled)
+        Checkbutton(window, text="Autostart with Windows", variable=autostart_var, command=toggle_autostart).pack(anchor="w", padx=10, pady=10)
 
     def toggle_record_all_meetings(self):
         """
@@ -293,7 +621,6 @@ class TeamsHelperRecorder:
         """
         self.record_all_meetings = not self.record_all_meetings
         state = "enabled" if self.record_all_meetings else "disabled"
-        print(f"[INFO] Record All Meetings is now {state}.")
         logging.info("Record All Meetings toggled to: %s", state)
 
     def toggle_keep_available(self):
@@ -303,7 +630,6 @@ class TeamsHelperRecorder:
         """
         self.keep_available = not self.keep_available
         state = "enabled" if self.keep_available else "disabled"
-        print(f"[INFO] Keep Available Status is now {state}.")
         logging.info("Keep Available Status toggled to: %s", state)
 
         if self.keep_available:
@@ -318,6 +644,9 @@ class TeamsHelperRecorder:
         def jiggler():
             INPUT_MOUSE = 0
             MOUSEEVENTF_MOVE = 0x0001
+            ES_CONTINUOUS = 0x80000000
+            ES_SYSTEM_REQUIRED = 0x00000001
+            ES_DISPLAY_REQUIRED = 0x00000002
 
             class MOUSEINPUT(ctypes.Structure):
                 _fields_ = [
@@ -344,16 +673,23 @@ class TeamsHelperRecorder:
                 ctypes.windll.user32.SendInput(1, ctypes.pointer(input_structure), ctypes.sizeof(input_structure))
 
             try:
-                while self.keep_available:
+                # Keep the system and display awake for as long as this thread runs
+                ctypes.windll.kernel32.SetThreadExecutionState(
+                    ES_CONTINUOUS | ES_SYSTEM_REQUIRED | ES_DISPLAY_REQUIRED
+                )
+                # Teams presence follows user input idle time, so a tiny move is still needed
+                while not self.jiggler_stop.is_set():
                     send_input(1, 0)  # Move slightly right
                     send_input(-1, 0)  # Move back
-                    time.sleep(60)  # Every 60 seconds
+                    self.jiggler_stop.wait(60)  # Every 60 seconds, wakes immediately on stop
             except Exception as e:
                 logging.error(f"Mouse Jiggler error: {e}")
             finally:
+                ctypes.windll.kernel32.SetThreadExecutionState(ES_CONTINUOUS)
                 logging.info("Mouse Jiggler stopped.")
 
         if self.jiggler_thread is None or not self.jiggler_thread.is_alive():
+            self.jiggler_stop.clear()
             self.jiggler_thread = threading.Thread(target=jiggler, daemon=True)
             self.jiggler_thread.start()
 
@@ -362,6 +698,7 @@ class TeamsHelperRecorder:
         Stop the Mouse Jiggler functionality.
         """
         self.keep_available = False
+        self.jiggler_stop.set()
         if self.jiggler_thread:
             self.jiggler_thread.join()
 								
@@ -372,55 +709,92 @@ class TeamsHelperRecorder:
         Establish a WebSocket connection to the Teams API.
         Monitors meeting events and triggers recording.
         """
-        base_url = "ws://localhost:8124"
-        url = f"{base_url}?protocol-version=2.0.0&manufacturer=Kyvaith&device=TeamsHelper&app=TeamsHelper&app-version=1.0"
-
-        print("[INFO] Connecting to Microsoft Teams API...")
         logging.info("Connecting to Microsoft Teams API...")
 
         try:
-            self.ws = create_connection(url)
-            self.ws.settimeout(1)  # Non-blocking mode
-            logging.info("Connected to Microsoft Teams WebSocket.")
-            print("[INFO] Connected to Microsoft Teams WebSocket.")
+            self.ws = create_connection(self.ws_url)
+        except Exception as e:
+            self.show_error("Teams API Connection Error", f"Failed to connect to Teams API: {e}")
+            return
+        # Block until a frame arrives; disconnect_from_teams wakes recv() when exiting
+        self.ws.settimeout(None)
+        logging.info("Connected to Microsoft Teams WebSocket.")
+
+        try:
+            # Pre-warm the audio devices so the first meeting starts recording immediately
+            try:
+                self.start_capture()
+            except Exception as e:
+                logging.error(f"Failed to start audio capture: {e}")
 
             while not self.stop_flag:
                 try:
                     message = self.ws.recv()
-                    self.handle_teams_update(message)
-                except WebSocketConnectionClosedException:
-                    logging.warning("WebSocket connection closed.")
-                    print("[WARN] WebSocket connection closed.")
+                except (WebSocketConnectionClosedException, OSError):
+                    if not self.stop_flag:
+                        logging.warning("WebSocket connection closed.")
                     break
-                except Exception as e:
-                    time.sleep(0.1)
-
-            if self.ws:
-                self.ws.close()
-                print("[INFO] WebSocket connection closed.")
-                logging.info("WebSocket connection closed.")
+                except WebSocketException as e:
+                    # A malformed frame leaves the stream in an unknown state, so disconnect
+                    logging.error(f"Invalid data from the Teams API, disconnecting: {e}")
+                    break
+                self.handle_teams_update(message)
+        finally:
+            # The devices are only kept open while Teams is connected; a recording
+            # in progress keeps them until it is stopped
+            if not self.recording:
+                self.stop_capture()
+            self.ws.close()
+            logging.info("WebSocket connection closed.")
+
+    def disconnect_from_teams(self):
+        """
+        Stop the Teams WebSocket loop, waking it up if it is blocked waiting for a frame.
+        """
+        self.stop_flag = True
+        if self.ws:
+            self.ws.abort()
 
-        except Exception as e:
-            self.show_error("Teams API Connection Error", f"Failed to connect to Teams API: {e}")
+    def shutdown(self):
+        """
+        Stop everything the recorder started so the process can exit on its own:
+        the Teams connection, an in-progress recording, audio capture, the
+        mouse jiggler and logging.
+        """
+        self.disconnect_from_teams()
+        if self.teams_thread:
+            # A meeting update being handled right now may still start or stop a recording
+            self.teams_thread.join(timeout=5)
+            self.teams_thread = None
+        if self.recording:
+            self.stop_recording()
+        self.stop_capture()
+        if self.jiggler_thread:
+            self.stop_mouse_jiggler()
+        logging.info("Teams Helper stopped.")
+        self.stop_logging()
 
     def handle_teams_update(self, message):
         """
         Process updates from Microsoft Teams WebSocket API.
         """
         try:
-            logging.debug("Received WebSocket message: %s", message)
-            update = json.loads(message)
+            # Only meeting updates affect recording, skip parsing anything else
+            marker = b"meetingUpdate" if isinstance(message, bytes) else "meetingUpdate"
+            if marker not in message:
+                return
 
             # Extract the meeting permissions and status
-            meeting_permissions = update.get("meetingUpdate", {}).get("meetingPermissions", {})
-            can_toggle_mute = meeting_permissions.get("canToggleMute", False)
+            can_toggle_mute = parse_can_toggle_mute(message)
 
             # Start or stop recording based on meeting state
             if self.record_all_meetings:
                 if can_toggle_mute and not self.can_toggle_mute:
+                    logging.debug("Meeting joined (canToggleMute became true).")
                     self.can_toggle_mute = True
                     self.start_recording()
                 elif not can_toggle_mute and self.can_toggle_mute:
+                    logging.debug("Meeting left (canToggleMute became false).")
                     self.can_toggle_mute = False
                     self.stop_recording()
 
@@ -429,93 +803,345 @@ class TeamsHelperRecorder:
 
     def start_recording(self):
         """
-        Start the audio recording process and initialize the MP3 encoder.
+        Start writing the captured audio to a new MP3 file.
+        The capture streams are opened first if they are not already running.
         """
-        print("[INFO] Starting recording...")
         logging.info("Starting recording...")
-        self.recording = True
-        self.update_tray_title()
-    
+        try:
+            self.start_capture()
+
+            formatted_time = datetime.now().strftime("%Y-%m-%d %H-%M-%S")
+            mp3_file = os.path.join(self.output_dir, f"Recording {formatted_time}.mp3")
+            # A large buffer turns the per-block writes into occasional big disk writes
+            mp3 = open(mp3_file, "wb", buffering=MP3_WRITE_BUFFER)
+        except Exception as e:
+            self.show_error("Recording Error", str(e))
+            return
+        logging.info("Recording directly to %s", mp3_file)
+        self.mp3_file = mp3_file
+
         # Initialize the MP3 encoder
-        self.encoder = lameenc.Encoder()
-        self.encoder.set_bit_rate(128)
-        self.encoder.set_in_sample_rate(self.sample_rate)
-        self.encoder.set_channels(self.channels)
-        self.encoder.set_quality(2)
-    
-        self.recording_thread = threading.Thread(target=self.record_audio)
-        self.recording_thread.start()
+        self.encoder = self.create_encoder()
+
+        self.encode_ring = RingBuffer(self.buffer_size * ENCODE_RING_BLOCKS, self.channels)
+        self.encode_stop.clear()
+        self.peak = 0
+        self.encoder_thread = threading.Thread(target=self.encode_worker, args=(mp3, self.encode_ring))
+        self.encoder_thread.start()
+
+        # The capture thread starts passing mixed blocks to the encoder as soon as this is set
+        self.recording_event.set()
+        self.update_tray_title()
 
-    def record_audio(self):
+    def create_encoder(self):
         """
-        Record audio from both Stereo Mix and Microphone.
+        Create a LAME MP3 encoder configured for the recording format.
         """
-        try:
-            stereo_mix_device = self.get_device_by_name("Stereo Mix")
-            microphone_device = self.get_device_by_name("Microphone")
+        # Imported on first recording so a session without meetings never loads LAME
+        import lameenc
+
+        encoder = lameenc.Encoder()
+        encoder.set_bit_rate(128)
+        encoder.set_in_sample_rate(self.sample_rate)
+        encoder.set_channels(self.channels)
+        # LAME quality trades CPU for psychoacoustic precision (2 = near best, 5 = standard,
+        # 7 = fast). At a fixed 128 kbps the file size is the same; 5 takes roughly half
+        # the CPU of 2 with no audible difference for speech.
+        encoder.set_quality(5)
+        return encoder
+
+    def start_capture(self):
+        """
+        Open the Stereo Mix and Microphone streams and start the thread that mixes them.
+        The streams stay open across meetings, so starting a recording does not pay for
+        device activation; does nothing if capture is already running.
+        Waits for a device reload in progress to finish first.
+        """
+        with self.capture_lock:
+            if self.capture_thread is not None and self.capture_thread.is_alive():
+                return
+
+            stereo_ring = RingBuffer(self.buffer_size * RING_BLOCKS, self.channels)
+            mic_ring = RingBuffer(self.buffer_size * RING_BLOCKS, self.channels)
+            stereo_stream, mic_stream = self.open_capture_streams(stereo_ring, mic_ring)
+            # Start both here so a device that fails to start is reported to the caller,
+            # e.g. before start_recording creates the MP3 file
+            try:
+                stereo_stream.start()
+                mic_stream.start()
+            except Exception:
+                stereo_stream.close()
+                mic_stream.close()
+                raise
+
+            self.stop_event.clear()
+            self.capture_thread = threading.Thread(
+                target=self.capture_audio,
+                args=(stereo_stream, mic_stream, stereo_ring, mic_ring),
+                daemon=True,
+            )
+            self.capture_thread.start()
+            logging.info("Audio capture started.")
 
-            if stereo_mix_device is None or microphone_device is None:
-                raise RuntimeError("Required audio devices not found.")
+    def stop_capture(self):
+        """
+        Stop the capture thread and close both capture streams.
+        """
+        with self.capture_lock:
+            self.stop_event.set()
+            if self.capture_thread:
+                self.capture_thread.join()
+                self.capture_thread = None
 
-            formatted_time = datetime.now().strftime("%Y-%m-%d %H-%M-%S")
-            mp3_file = os.path.join(self.output_dir, f"Recording {formatted_time}.mp3")
-            print(f"[INFO] Recording directly to {mp3_file}")
-
-            with open(mp3_file, "wb") as mp3:
-                with sd.InputStream(samplerate=self.sample_rate,
-                                    channels=self.channels,
-                                    dtype='int16',
-                                    device=stereo_mix_device,
-                                    blocksize=self.buffer_size) as stereo_stream, \
-                     sd.InputStream(samplerate=self.sample_rate,
-                                    channels=self.channels,
-                                    dtype='int16',
-                                    device=microphone_device,
-                                    blocksize=self.buffer_size) as mic_stream:
-
-                    while self.recording:
-                        stereo_data, _ = stereo_stream.read(self.buffer_size)
-                        mic_data, _ = mic_stream.read(self.buffer_size)
-                        combined_data = np.add(stereo_data, mic_data, dtype=np.int32)
-
-                        # Normalize audio if it exceeds 16-bit range
-                        max_value = np.max(np.abs(combined_data))
-                        if max_value > 32767:
-                            scaling_factor = 32767 / max_value
-                            combined_data = (combined_data * scaling_factor).astype(np.int16)
-                        else:
-                            combined_data = combined_data.astype(np.int16)
-
-                        mp3_data = self.encoder.encode(combined_data.tobytes())
-                        mp3.write(mp3_data)
-
-                mp3.write(self.encoder.flush())
-
-            print(f"[INFO] Recording saved as {mp3_file}")
+    def capture_audio(self, stereo_stream, mic_stream, stereo_ring, mic_ring):
+        """
+        Mix audio from both Stereo Mix and Microphone until capture is stopped.
+        Each device delivers blocks through its own PortAudio callback into a ring buffer;
+        this thread drains matched blocks from both rings. While recording, the mix is
+        written to the encoder ring buffer, otherwise the blocks are discarded.
+        """
+        priority_handle = boost_thread_priority()
+        try:
+            stereo_data = np.empty((self.buffer_size, self.channels), dtype=np.int16)
+            mic_data = np.empty((self.buffer_size, self.channels), dtype=np.int16)
+            # Flat views of the block buffers for the mixer, created once
+            stereo_samples = stereo_data.reshape(-1)
+            mic_samples = mic_data.reshape(-1)
+            out_samples = self._out16.reshape(-1)
+            mix_samples = self._mixbuf.reshape(-1)
+            block_duration = self.buffer_size / self.sample_rate
+            # Peak metering samples one block per second instead of scanning every block
+            meter_interval = max(1, self.sample_rate // self.buffer_size)
+            # Number of consecutive waits for data, used to notice a device that stopped delivering
+            stall_limit = int(CAPTURE_STALL_SECONDS / (block_duration / 2))
+            idle_waits = 0
+            block_counter = 0
+            realigned = 0
+
+            try:
+                while not self.stop_event.is_set():
+                    # The devices run on independent clocks, so one ring slowly gets ahead of
+                    # the other. Discard the leading ring's oldest frames to keep both in step.
+                    surplus = stereo_ring.read_space - mic_ring.read_space
+                    if abs(surplus) > self.buffer_size * MAX_DRIFT_BLOCKS:
+                        realigned += (stereo_ring if surplus > 0 else mic_ring).skip(abs(surplus))
+
+                    if stereo_ring.read_space < self.buffer_size or mic_ring.read_space < self.buffer_size:
+                        # A stream stops when its device is removed or fails; without this the
+                        # loop would keep waiting and the recording would silently stay empty
+                        for name, stream in (("Stereo Mix", stereo_stream), ("Microphone", mic_stream)):
+                            if not stream.active:
+                                raise RuntimeError(f"The {name} device stopped delivering audio.")
+                        idle_waits += 1
+                        if idle_waits > stall_limit:
+                            if surplus:
+                                device = "Microphone device" if surplus > 0 else "Stereo Mix device"
+                            else:
+                                device = "Stereo Mix and Microphone devices"
+                            raise RuntimeError(f"No audio received from the {device} "
+                                               f"for {CAPTURE_STALL_SECONDS} seconds.")
+                        # Nothing to mix yet, sleep for about half a block
+                        self.stop_event.wait(block_duration / 2)
+                        continue
+                    idle_waits = 0
+
+                    stereo_ring.read_into(stereo_data)
+                    mic_ring.read_into(mic_data)
+                    if not self.recording_event.is_set():
+                        continue
+
+                    mix_clip(stereo_samples, mic_samples, out_samples, mix_samples)
+
+                    block_counter += 1
+                    if block_counter % meter_interval == 0:
+                        self.peak = max(self.peak, int(self._out16.max()), -int(self._out16.min()))
+
+                    # Never block capture on the encoder, the ring drops what does not fit
+                    self.encode_ring.write(self._out16)
+            finally:
+                # Closing aborts the running streams and releases the devices
+                stereo_stream.close()
+                mic_stream.close()
+
+            if stereo_ring.dropped or mic_ring.dropped:
+                logging.warning("Dropped frames during capture (Stereo Mix: %d, Microphone: %d).",
+                                stereo_ring.dropped, mic_ring.dropped)
+            if stereo_ring.overflows or mic_ring.overflows:
+                logging.warning("Input overflows during capture (Stereo Mix: %d, Microphone: %d).",
+                                stereo_ring.overflows, mic_ring.overflows)
+            if realigned:
+                logging.info("Discarded %d frames to realign drifting capture devices.", realigned)
+            logging.info("Audio capture stopped.")
         except Exception as e:
             self.show_error("Recording Error", str(e))
+        finally:
+            restore_thread_priority(priority_handle)
+
+    def open_capture_streams(self, stereo_ring, mic_ring):
+        """
+        Open the Stereo Mix and Microphone callback streams feeding `stereo_ring` and `mic_ring`.
+        Uses the cached device indices; if a device is missing or PortAudio rejects a
+        cached index (e.g. after devices changed), PortAudio is re-initialized to enumerate
+        the current devices and opening is retried once. Called by start_capture with
+        `capture_lock` held.
+        """
+        for attempt in range(2):
+            if attempt:
+                # No stream is open here, so PortAudio can safely be re-initialized
+                self.reinitialize_audio()
+
+            if self.stereo_mix_device is None or self.microphone_device is None:
+                if attempt:
+                    raise RuntimeError("Required audio devices not found.")
+                continue
+
+            stereo_stream = None
+            try:
+                # Let each driver pick its native block size, the rings regroup the
+                # frames into fixed blocks for the mixer
+                stereo_stream = sd.RawInputStream(samplerate=self.sample_rate,
+                                                  channels=self.channels,
+                                                  dtype='int16',
+                                                  device=self.stereo_mix_device,
+                                                  blocksize=0,
+                                                  latency='low',
+                                                  callback=self.make_capture_callback(stereo_ring))
+                mic_stream = sd.RawInputStream(samplerate=self.sample_rate,
+                                               channels=self.channels,
+                                               dtype='int16',
+                                               device=self.microphone_device,
+                                               blocksize=0,
+                                               latency='low',
+                                               callback=self.make_capture_callback(mic_ring))
+                return stereo_stream, mic_stream
+            except sd.PortAudioError as e:
+                if stereo_stream is not None:
+                    stereo_stream.close()
+                if attempt:
+                    raise
+                logging.warning("Failed to open audio devices, reloading the device list: %s", e)
+
+    def encode_worker(self, mp3, ring):
+        """
+        Encode mixed PCM frames taken from `ring` and write them to `mp3`.
+        Runs on its own thread so LAME and disk stalls never delay capture; all I/O on
+        `mp3` happens here. Once `encode_stop` is set, encodes what is left, flushes the
+        encoder, syncs and closes the file and exits.
+        """
+        priority_handle = boost_thread_priority()
+        # Frames are handed to LAME several blocks at a time to cut per-call overhead
+        staging = np.empty((self.buffer_size * ENCODE_BATCH_BLOCKS, self.channels), dtype=np.int16)
+        batch_duration = len(staging) / self.sample_rate
+        try:
+            while True:
+                if ring.read_into(staging):
+                    mp3.write(self.encoder.encode(staging))
+                    continue
+                if self.encode_stop.is_set():
+                    remaining = ring.read_space
+                    if remaining:
+                        ring.read_into(staging[:remaining])
+                        mp3.write(self.encoder.encode(staging[:remaining]))
+                    mp3.write(self.encoder.flush())
+                    # Make the finished recording durable once, rather than syncing while writing
+                    mp3.flush()
+                    os.fsync(mp3.fileno())
+                    return
+                # Less than a batch available, wait for about half a batch to arrive
+                self.encode_stop.wait(batch_duration / 2)
+        except Exception as e:
+            self.show_error("Encoding Error", str(e))
+        finally:
+            mp3.close()
+            restore_thread_priority(priority_handle)
+
+    def make_capture_callback(self, ring):
+        """
+        Create a PortAudio input callback that pushes captured blocks into `ring`.
+        The callback runs on the audio thread, so it only copies data and never blocks.
+        """
+        channels = self.channels
+
+        def callback(indata, frames, time_info, status):
+            if status.input_overflow:
+                # Audio was lost before it reached us; counted and logged when capture stops
+                ring.overflows += 1
+            # Zero-copy int16 view of the raw CFFI buffer. PortAudio reuses `indata`
+            # after returning, RingBuffer.write copies it out.
+            ring.write(np.frombuffer(indata, dtype=np.int16).reshape(frames, channels))
+        return callback
 
     def stop_recording(self):
         """
-        Stop the audio recording process and reset the MP3 encoder.
+        Stop writing audio and wait for the encoder thread to finish the file.
+        The capture streams keep running for the next meeting.
         """
-        print("[INFO] Stopping recording...")
         logging.info("Stopping recording...")
-        self.recording = False
+        self.recording_event.clear()
         self.update_tray_title()
-        if hasattr(self, "recording_thread"):
-            self.recording_thread.join()
-    
+        if self.encoder_thread is None:
+            return
+
+        # The worker encodes the remaining frames, flushes the encoder, closes the file and exits
+        self.encode_stop.set()
+        self.encoder_thread.join()
+        self.encoder_thread = None
+
+        if self.encode_ring.dropped:
+            logging.warning("Encoder fell behind, dropped %d frames.", self.encode_ring.dropped)
+        if self.peak:
+            logging.info("Sampled peak level: %.1f dBFS", 20 * np.log10(self.peak / 32768))
+        logging.info("Recording saved as %s", self.mp3_file)
+
         # Reset the encoder to avoid future initialization issues
         self.encoder = None
 
+    def refresh_devices(self):
+        """
+        Enumerate audio devices and cache the Stereo Mix and Microphone indices.
+        """
+        self.device_names = [device.get("name", "").lower() for device in sd.query_devices()]
+        self.stereo_mix_device = self.get_device_by_name("Stereo Mix")
+        self.microphone_device = self.get_device_by_name("Microphone")
+        logging.info("Audio devices: Stereo Mix=%s, Microphone=%s", self.stereo_mix_device, self.microphone_device)
+
+    def reload_audio_devices(self):
+        """
+        Re-scan audio devices, e.g. after Stereo Mix was enabled, and reopen capture on them.
+        """
+        logging.info("Reloading audio devices...")
+        try:
+            # Held throughout so a meeting starting meanwhile waits for the new streams
+            # instead of opening its own while PortAudio is being re-initialized
+            with self.capture_lock:
+                was_capturing = self.capture_thread is not None
+                self.stop_capture()
+                self.reinitialize_audio()
+                if was_capturing or self.recording:
+                    self.start_capture()
+        except Exception as e:
+            self.show_error("Audio Device Error", str(e))
+
+    def reinitialize_audio(self):
+        """
+        Re-initialize PortAudio and refresh the cached device indices.
+        PortAudio only enumerates devices when it is initialized, so this picks up devices
+        added or enabled since startup. Must be called with `capture_lock` held and no
+        stream open.
+        """
+        # sounddevice has no public API for this; _terminate/_initialize are private
+        # helpers and may change between sounddevice releases
+        sd._terminate()
+        sd._initialize()
+        self.refresh_devices()
+
     def get_device_by_name(self, device_name):
         """
-        Find an audio device by its name.
+        Find an audio device by its name in the cached device list.
         """
-        devices = sd.query_devices()
-        for i, device in enumerate(devices):
-            if device_name.lower() in device.get("name", "").lower():
+        device_name = device_name.lower()
+        for i, name in enumerate(self.device_names):
+            if device_name in name:
                 return i
         return None
 
@@ -525,9 +1151,8 @@ def create_tray_icon(recorder):
     Create the system tray icon with context menu.
     """
     def exit_app(icon, item):
-        recorder.stop_flag = True
+        # Ends tray_icon.run(); main() then shuts the recorder down
         icon.stop()
-        sys.exit(0)
 
     menu = Menu(
         MenuItem(
@@ -540,13 +1165,12 @@ def create_tray_icon(recorder):
             lambda icon, item: recorder.toggle_keep_available(),
             checked=lambda item: recorder.keep_available,
         ),
+        MenuItem("Refresh Audio Devices", lambda icon, item: recorder.reload_audio_devices()),
         MenuItem("Settings", lambda icon, item: recorder.show_settings_window()),
         MenuItem("Exit", exit_app),
     )
 
-    icon_path = recorder.get_icon_path()
-    icon_image = Image.open(icon_path)
-    icon = Icon("Teams Helper", icon_image, "Teams Helper - Idle", menu)
+    icon = Icon("Teams Helper", recorder.get_icon_image(), "Teams Helper - Idle", menu)
     recorder.set_tray_icon(icon)
     return icon
 
@@ -559,11 +1183,14 @@ def main():
     tray_icon = create_tray_icon(recorder)
 
     # Start Teams WebSocket connection in a separate thread
-    threading.Thread(target=recorder.connect_to_teams, daemon=True).start()
+    recorder.teams_thread = threading.Thread(target=recorder.connect_to_teams, daemon=True)
+    recorder.teams_thread.start()
 
     signal.signal(signal.SIGINT, lambda sig, frame: tray_icon.stop())
 
     tray_icon.run()
+    # Reached after Exit or Ctrl+C, both of which only stop the tray icon
+    recorder.shutdown()
 
 
 if __name__ == "__main__":